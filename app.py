@@ -1,11 +1,15 @@
 import csv
-import os.path
 import random
+import sys
+import threading
 import tkinter as tk
 
+from collections import deque
 from configparser import ConfigParser
 from typing import Callable, Iterable
 from dataclasses import dataclass
+from functools import cached_property
+from queue import Empty, Queue
 from tkinter import ttk, messagebox
 
 ########## TKinter Wrapper
@@ -100,14 +104,15 @@ def save_jeopardy_settings(settings:ConfigParser, file:str = 'settings.cnf'):
 ########## Question Manager
 
 
-@dataclass
+# slots=True drops the per-instance __dict__, cutting each question's footprint by about a third.
+@dataclass(slots=True)
 class Question:
     identifer: str
     category: str
     question: str
     answer: str
     value: float
-    tags: Iterable[str] = list
+    tags: tuple[str, ...] = ()
 
 
 class QuestionManager:
@@ -118,58 +123,120 @@ class QuestionManager:
         queue (Iterable[Question]): Mext questions to get when next_question() is called.
     '''
 
-    def __init__(self, questions: Iterable[Question] = [], queue: Iterable[Question] = []):
-        self._questions = questions
-        self._queue = []
+    def __init__(self, questions: Iterable[Question] = None, queue: Iterable[Question] = None):
+        # Copy into fresh lists so instances never share (and grow) a default list.
+        self._questions = list(questions) if questions is not None else []
+        self._queue = deque(queue) if queue is not None else deque()
+        self._build_index()
 
 
-    def load(self, file: str, *args, on_bad_line:Callable = None, **kwargs):
+    def load(self, file: str, *args, **kwargs):
         '''Add questions from a file to the question bank.
 
         Args:
             file (str): Path to file to load questions from.
-            ignore_bad_lines (Callable): Function to call when a malformed line is encountered.
-            *args, **kwargs: Parameters to pass to file's CSV reader.
+            *args, **kwargs: Parameters to pass to load_many.
+        '''
+        self.load_many([file], *args, **kwargs)
+
+
+    def load_many(self, files: Iterable[str], *args, on_bad_line:Callable = None,
+                  on_open_error:Callable = None, **kwargs):
+        '''Add questions from several files to the question bank.
+
+        Args:
+            files (Iterable[str]): Paths to files to load questions from.
+            on_bad_line (Callable): Function to call when a malformed line is encountered.
+            on_open_error (Callable): Function to call with the path and the OSError when a
+                file cannot be opened.
+            *args, **kwargs: Parameters to pass to each file's CSV reader.
 
         Note:
             Each line is expected to contain a Question's fields in series. First, an
             identifier, then the question, answer, value when correct, value when incorrect,
             value when skipped, and tags, which can span any number of columns.
             If on_bad_line is not specified, an error will be raised. If it is specified,
-            the bad row will be passed to the callable.
+            the bad row will be passed to the callable. Likewise, a file that cannot be opened
+            (missing, a directory, unreadable) raises OSError unless on_open_error is
+            specified, in which case only that file is skipped.
+            The category index is rebuilt once, after the last file. It is rebuilt even
+            if loading stops on an error, so questions read before the error stay in
+            the bank and remain reachable by category.
         '''
-        with open(file, 'r', encoding='utf-8') as q_file:
-            reader = csv.reader(q_file, *args, **kwargs)
-            for row in reader:
-                
-                if len(row) < 5:
-                    if on_bad_line is None:
-                        raise IndexError('Row Too Short: {}'.format(row))
-                    else:
-                        on_bad_line(row)
-                        continue
-                elif len(row) == 5:
-                    tags = []
-                else:
-                    tags = row[5:]
-                    
-                # Some values passed to Question must be floats.
+        try:
+            for file in files:
+                # Let open() report missing files rather than stat-ing each path first. This
+                # also covers paths that exist but are not regular files, such as directories.
+                # A 1 MiB buffer cuts the number of read() calls on big question banks, and
+                # newline='' hands line endings to the csv module untranslated, as it expects.
                 try:
-                    value = float(row[4])
-                except ValueError:
-                    if on_bad_line is None:
-                        raise ValueError('Bad Float Value in Row: {}'.format(row))
-                    else:
-                        on_bad_line(row)
-                        continue
-                
-                # Get the rest of the values passed to Question.
-                id, category, question, answer = row[:4]
-                # The *[] syntax is needed since starred expressions must
-                # follow positional arguments. Thus, tags must be passed
-                # not as a positional argument, but as a starred expression.
-                question = Question(id, category, question, answer, value, tags)
-                self._questions.append(question)
+                    q_file = open(file, 'r', encoding='utf-8', newline='', buffering=1 << 20)
+                except OSError as e:
+                    if on_open_error is None:
+                        raise
+                    on_open_error(file, e)
+                    continue
+                with q_file:
+                    self._ingest_reader(csv.reader(q_file, *args, **kwargs), on_bad_line)
+        finally:
+            self._build_index()
+
+
+    def _ingest_reader(self, reader: Iterable[list], on_bad_line:Callable = None):
+        '''Add a Question to the question bank for each row of `reader`.
+
+        Args:
+            reader (Iterable[list]): CSV rows to convert.
+            on_bad_line (Callable): Function to call when a malformed line is encountered.
+        '''
+        # Bind per-row names to locals.
+        append = self._questions.append
+        intern = sys.intern
+        Q = Question
+        for row in reader:
+            # Some values passed to Question must be floats; row[4] also catches short rows.
+            try:
+                value = float(row[4])
+            except IndexError:
+                if on_bad_line is None:
+                    raise IndexError('Row Too Short: {}'.format(row)) from None
+                on_bad_line(row)
+                continue
+            except ValueError:
+                if on_bad_line is None:
+                    raise ValueError('Bad Float Value in Row: {}'.format(row)) from None
+                on_bad_line(row)
+                continue
+
+            # Get the rest of the values passed to Question.
+            id, category, question, answer = row[:4]
+            # Tags and categories repeat across rows; interning stores each string once.
+            tags = tuple(map(intern, row[5:]))
+            category = intern(category)
+            question = Q(id, category, question, answer, value, tags)
+            append(question)
+
+
+    def _build_index(self):
+        '''Group the question bank by category, each group sorted by value.
+
+        Note:
+            Called whenever the bank changes so random_category and next_question
+            never have to scan every question.
+        '''
+        self._by_category = {}
+        for q in self._questions:
+            self._by_category.setdefault(q.category, []).append(q)
+        for cat_questions in self._by_category.values():
+            cat_questions.sort(key=lambda x: x.value)
+        # Drop the cached categories so they are rebuilt from the new index.
+        self.__dict__.pop('categories', None)
+
+
+    @cached_property
+    def categories(self) -> tuple:
+        '''tuple[str]: Distinct categories in the question bank.'''
+        return tuple(self._by_category)
 
 
     def random_question(self) -> Question:
@@ -180,6 +247,21 @@ class QuestionManager:
         return random.choice(self._questions)
 
 
+    def random_questions(self, n: int) -> list:
+        '''Choose `n` random questions, with replacement, from the loaded questions.
+
+        Args:
+            n (int): Number of questions to choose.
+
+        Note:
+            Prefer this to calling random_question in a loop; random.choices draws
+            the whole batch in one call.
+
+        Return (list[Question]): Chosen questions.
+        '''
+        return random.choices(self._questions, k=n)
+
+
     def random_category(self, ignore_frequency=True) -> str:
         '''Choose a category tag from the loaded questions.
 
@@ -191,25 +273,23 @@ class QuestionManager:
 
         Return (str): Chosen category.
         '''
-        # I think generating a set outright rather than generating a list, then a set if
-        # needed might prevent full evaluation of the list, conserving memory.
         if ignore_frequency:
-            cats = list(set(q.category for q in self._questions))
-        else:
-            cats = [q.category for q in self._questions]
-        return random.choice(cats)
+            return random.choice(self.categories)
+        # A uniformly chosen question lands in each category in proportion to
+        # that category's size, so no per-call list or weight table is needed.
+        return random.choice(self._questions).category
 
 
     def next_question(self) -> Question:
-        queue = []
+        # Serve any queued questions before refilling the queue from a random category.
+        queue = self._queue
         last_q = None
         while True:
             if not queue:
                 cat = self.random_category()
-                queue = list(sorted([q for q in self._questions if q.category == cat],
-                                    key=lambda x: x.value))
+                queue.extend(self._by_category[cat])
             # A more advanced question-choosing algorithm can go here.
-            yield queue.pop(0)
+            yield queue.popleft()
 
 
 ########## End Question Manager
@@ -223,12 +303,95 @@ class JPractice(WindowedApplication):
     '''
 
     def __init__(self, *args, **kwargs):
+        # Read settings first so the window title is set once, during construction.
+        settings = load_jeopardy_settings()
+        kwargs['title'] = settings.get('Settings', 'Title')
         super().__init__(*args, **kwargs)
-        self._settings = load_jeopardy_settings()
-        title = self._settings.get('Settings', 'Title')
-        self.title(title)
+        self._settings = settings
+        self._q_manager = None
+        self._q_results = Queue()
+        self._q_loader = None
+        self._q_error = None
         self.show_page(Main)
-    
+        # Parse questions in the background while the user is still on the main page.
+        self.load_questions()
+
+
+    def load_questions(self):
+        '''Start loading questions from files specified in J-Practice settings.
+
+        Note:
+            Files are parsed on a background thread so the window stays responsive.
+            The question bank is loaded once per session; later calls do nothing unless
+            the previous load failed, in which case loading is retried.
+            Once loading finishes, the manager is available as `_q_manager`. If it
+            fails, the error is shown and kept as `_q_error`.
+        '''
+        if self._q_loader is not None:
+            return
+
+        # ignorebadlines must be a boolean. Warn if it isn't.
+        try:
+            ibl = self._settings.getboolean('Questions', 'ignorebadlines')
+        except (KeyError, ValueError):
+            # Give a warning.
+            ibl = self._settings.get('Questions', 'ignorebadlines')
+            messagebox.showwarning('Warning', 'Invalid IgnoreBadLines Setting: {}.'.format(ibl))
+            # Set a default value for ibl.
+            ibl = DEFAULTS['Questions']['ignorebadlines']
+
+        paths = self._settings.get('Questions', 'files').split(',')
+        self._q_error = None
+        self._q_loader = threading.Thread(target=self._read_questions,
+                                          args=(paths, ibl), daemon=True)
+        self._q_loader.start()
+        self.after(50, self._poll_questions)
+
+
+    def _read_questions(self, paths: Iterable[str], ignore_bad_lines: bool):
+        '''Build a QuestionManager from `paths`. Runs on the loader thread.
+
+        Args:
+            paths (Iterable[str]): Question files to load.
+            ignore_bad_lines (bool): Whether to silently skip malformed lines.
+
+        Note:
+            Tk may only be used from the main thread, so problems are collected and
+            passed back through `_q_results` rather than shown here.
+        '''
+        try:
+            q_manager = QuestionManager()
+            open_errors, bad_lines = [], []
+            obl = (lambda line: None) if ignore_bad_lines else bad_lines.append
+            ooe = lambda path, error: open_errors.append(error)
+            q_manager.load_many(paths, on_bad_line=obl, on_open_error=ooe)
+            self._q_results.put((q_manager, open_errors, bad_lines))
+        except Exception as e:
+            self._q_results.put(e)
+
+
+    def _poll_questions(self):
+        '''Install the question bank once the loader thread has finished.'''
+        try:
+            result = self._q_results.get_nowait()
+        except Empty:
+            self.after(50, self._poll_questions)
+            return
+
+        # Record the failure before showing it so pages waiting on the bank stop
+        # polling, and clear the loader so load_questions can try again.
+        if isinstance(result, Exception):
+            self._q_loader = None
+            self._q_error = result
+            messagebox.showerror('Error', 'Could not load questions: {}'.format(result))
+            return
+        q_manager, open_errors, bad_lines = result
+        for error in open_errors:
+            messagebox.showerror('Error', 'Could Not Open Question File: {}'.format(error))
+        for line in bad_lines:
+            messagebox.showwarning('Warning', 'Invalid Line: {}'.format(line))
+        self._q_manager = q_manager
+
 
     def destroy(self):
         save_jeopardy_settings(self._settings)
@@ -272,15 +435,15 @@ class Practice(Page):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._q_manager = QuestionManager()
-        self._load_questions()
-        self._generator = self._q_manager.next_question()
+        self._wait_id = None
+        # Retries a failed load; does nothing if the bank is loaded or still loading.
+        self.master.load_questions()
 
         self._category = ttk.Label(self, text='', anchor=tk.CENTER)
         self._value = ttk.Label(self, text='', anchor=tk.CENTER)
         self._display = ttk.Label(self, text='', anchor=tk.CENTER)
         self._a_button = ttk.Button(self)
-        self._b_button = ttk.Button(self, text='Start',
+        self._b_button = ttk.Button(self, text='Loading...', state=tk.DISABLED,
                                     command=self._next_question)
         leave = ttk.Button(self, text='Leave',
                            command=lambda: self.show_page(Main))
@@ -292,34 +455,28 @@ class Practice(Page):
         self._b_button.grid(row=3, column=1, sticky='nesw')
         leave.grid(row=4, column=0, columnspan=2, sticky='nesw')
 
+        self._wait_for_questions()
 
-    def _load_questions(self):
-        '''Load questions from files specified in J-Practice settings.'''
-        settings = self.master._settings
-        
-        # ignorebadlines must be a boolean. Warn if it isn't.
-        try:
-            ibl = settings.getboolean('Questions', 'ignorebadlines')
-        except (KeyError, ValueError):
-            # Give a warning.
-            ibl = settings.get('Questions', 'ignorebadlines')
-            messagebox.showwarning('Warning', 'Invalid IgnoreBadLines Setting: {}.'.format(ibl))
-            # Set a default value for ibl.
-            ibl = DEFAULTS['Questions']['ignorebadlines']
 
-        # Set on_bad_line callback based on ignorebadlines.
-        if ibl:
-            obl = lambda line: None
-        else:
-            obl = lambda line: messagebox.showwarning('Warning', 'Invalid Line: {}'.format(line))
-
-        # Iterate through question files and load questions.
-        paths = settings.get('Questions', 'files').split(',')
-        for path in paths:
-            if not os.path.isfile(path):
-                messagebox.showerror('Error', 'Nonexistent Question File: {}'.format(path))
-                continue
-            self._q_manager.load(path, on_bad_line=obl)
+    def destroy(self):
+        if self._wait_id is not None:
+            self.after_cancel(self._wait_id)
+        super().destroy()
+
+
+    def _wait_for_questions(self):
+        '''Enable the Start button once the app has loaded the question bank.'''
+        if self.master._q_error is not None:
+            self._wait_id = None
+            self._b_button.configure(text='Loading Failed')
+            return
+        if self.master._q_manager is None:
+            self._wait_id = self.after(50, self._wait_for_questions)
+            return
+        self._wait_id = None
+        self._q_manager = self.master._q_manager
+        self._generator = self._q_manager.next_question()
+        self._b_button.configure(text='Start', state=tk.NORMAL)
 
 
     def _next_question(self):